@@ -1,9 +1,22 @@
 __version__ = "0.1.0"
 
-from .builder import build_bwrap_command
-from .composer import compose_profiles
-from .config import load_profile, validate_profile
-from .parser import parse_bwrap_command
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .builder import build_bwrap_command
+    from .composer import compose_profiles
+    from .config import load_profile, validate_profile
+    from .parser import parse_bwrap_command
+
+# Public name → defining submodule.  Submodules are imported on first access
+# so that ``bwrap_compose.cli`` only loads what the running command needs.
+_EXPORTS = {
+    "build_bwrap_command": "builder",
+    "compose_profiles": "composer",
+    "load_profile": "config",
+    "parse_bwrap_command": "parser",
+    "validate_profile": "config",
+}
 
 __all__ = [
     "build_bwrap_command",
@@ -12,3 +25,14 @@ __all__ = [
     "parse_bwrap_command",
     "validate_profile",
 ]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
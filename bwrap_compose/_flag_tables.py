@@ -0,0 +1,50 @@
+"""bwrap flag tables shared by the parser, composer and builder."""
+
+import sys
+from typing import Dict, FrozenSet, Iterable
+
+
+def _interned(flags: Iterable[str]) -> FrozenSet[str]:
+    """Freeze *flags*, interning each so table lookups can match by identity."""
+    return frozenset(map(sys.intern, flags))
+
+
+# Flags that take no value (namespace / session setup).
+ZERO_ARG_FLAGS: FrozenSet[str] = _interned({
+    "--unshare-user", "--unshare-user-try", "--unshare-ipc",
+    "--unshare-pid", "--unshare-net", "--unshare-uts",
+    "--unshare-cgroup", "--unshare-cgroup-try", "--unshare-all",
+    "--share-net", "--die-with-parent", "--as-pid-1",
+    "--new-session", "--clearenv",
+})
+
+# Flags that take exactly one value.
+ONE_ARG_FLAGS: FrozenSet[str] = _interned({
+    "--unsetenv", "--chdir", "--tmpfs", "--dir", "--proc", "--dev",
+    "--remount-ro", "--uid", "--gid", "--hostname", "--lock-file",
+    "--file", "--bind-data", "--ro-bind-data", "--perms", "--size", "--chmod",
+})
+
+# Bind mounts (src, dest), split by the profile mode they map to.
+RW_BIND_FLAGS: FrozenSet[str] = _interned({
+    "--bind", "--bind-try", "--dev-bind", "--dev-bind-try",
+})
+RO_BIND_FLAGS: FrozenSet[str] = _interned({"--ro-bind", "--ro-bind-try"})
+BIND_FLAGS: FrozenSet[str] = RW_BIND_FLAGS | RO_BIND_FLAGS
+
+# Non-mount flags that take exactly two values (key+value or target+link).
+TWO_ARG_FLAGS: FrozenSet[str] = _interned({"--setenv", "--symlink"})
+
+# One-arg flags that create directories (emitted after tmpfs, before mounts).
+DIR_FLAGS: FrozenSet[str] = _interned({"--dir"})
+
+# One-arg flags emitted late (after mounts).
+LATE_FLAGS: FrozenSet[str] = _interned({"--chdir"})
+
+# Number of values each known flag consumes.
+FLAG_ARITY: Dict[str, int] = {
+    **{f: 0 for f in ZERO_ARG_FLAGS},
+    **{f: 1 for f in ONE_ARG_FLAGS},
+    **{f: 2 for f in TWO_ARG_FLAGS},
+    **{f: 2 for f in BIND_FLAGS},
+}
@@ -1,28 +1,34 @@
-from typing import Dict, Any, List, Optional, Set
+import sys
+from typing import Dict, Any, FrozenSet, List, Optional, Sequence, Tuple
 
-# Modes recognised as read-only in profile YAML.
-_RO_MODES = {"ro", "readonly"}
-
-# Zero-arg flags emitted early (namespace setup).
-_NAMESPACE_FLAGS: Set[str] = {
-    "--unshare-user", "--unshare-user-try", "--unshare-ipc",
-    "--unshare-pid", "--unshare-net", "--unshare-uts",
-    "--unshare-cgroup", "--unshare-cgroup-try", "--unshare-all",
-    "--share-net", "--die-with-parent", "--as-pid-1",
-    "--new-session", "--clearenv",
-}
-
-# One-arg flags that create directories (emitted after tmpfs, before mounts).
-_DIR_FLAGS: Set[str] = {"--dir"}
-
-# One-arg flags emitted late (after mounts).
-_LATE_FLAGS: Set[str] = {"--chdir"}
+from ._flag_tables import DIR_FLAGS, LATE_FLAGS, ONE_ARG_FLAGS, ZERO_ARG_FLAGS
 
-# One-arg flags (for parsing purposes).
-_ONE_ARG_FLAGS: Set[str] = {
-    "--unsetenv", "--chdir", "--tmpfs", "--dir", "--proc", "--dev",
-    "--remount-ro", "--uid", "--gid", "--hostname", "--lock-file",
-    "--file", "--bind-data", "--ro-bind-data", "--perms", "--size", "--chmod",
+# Modes recognised as read-only in profile YAML.
+_RO_MODES: FrozenSet[str] = frozenset({"ro", "readonly"})
+
+# Read-only flag for canonical (lower-case) modes, as produced by load_profile.
+_MODE_IS_RO: Dict[str, bool] = {"ro": True, "readonly": True, "rw": False}
+
+# Shared empty default for optional sequence keys (avoids a new [] per lookup).
+_EMPTY: Tuple[Any, ...] = ()
+
+# Flags emitted by build_bwrap_command, interned once so every argv shares
+# the same string objects.
+_RO_BIND = sys.intern("--ro-bind")
+_BIND = sys.intern("--bind")
+_SETENV = sys.intern("--setenv")
+_TMPFS = sys.intern("--tmpfs")
+_DEV = sys.intern("--dev")
+_PROC = sys.intern("--proc")
+_DOUBLE_DASH = sys.intern("--")
+
+# Category of each known flag, so _categorise_args needs one lookup per token.
+_KIND_NAMESPACE, _KIND_DIR, _KIND_LATE, _KIND_OTHER = range(4)
+_FLAG_KIND: Dict[str, int] = {
+    **{f: _KIND_OTHER for f in ONE_ARG_FLAGS},
+    **{f: _KIND_DIR for f in DIR_FLAGS},
+    **{f: _KIND_LATE for f in LATE_FLAGS},
+    **{f: _KIND_NAMESPACE for f in ZERO_ARG_FLAGS},
 }
 
 
@@ -43,32 +49,33 @@ def _expand_path(path: str) -> str:
     left unexpanded so the generated command remains portable — the shell or
     the caller is responsible for expansion when the command is executed.
     """
-    if len(path) >= 2 and path.startswith("'") and path.endswith("'"):
+    # Cheap first-character test: nearly all paths are unquoted.
+    if path[:1] != "'":
+        return path
+    if len(path) >= 2 and path[-1] == "'":
         return path[1:-1]
     return path
 
 
-def _categorise_args(args: List[str]):
+def _categorise_args(args: Sequence[str]):
     """Split raw args into (namespace, dir, late, other) groups."""
     namespace = []
     dirs = []
     late = []
     other = []
+    # Indexed by flag kind; namespace flags take no value and are handled first.
+    buckets = (namespace, dirs, late, other)
 
     i = 0
-    while i < len(args):
+    n = len(args)
+    while i < n:
         tok = args[i]
-        if tok in _NAMESPACE_FLAGS:
+        kind = _FLAG_KIND.get(tok)
+        if kind == _KIND_NAMESPACE:
             namespace.append(tok)
             i += 1
-        elif tok in _DIR_FLAGS and i + 1 < len(args):
-            dirs += [tok, _expand_path(args[i + 1])]
-            i += 2
-        elif tok in _LATE_FLAGS and i + 1 < len(args):
-            late += [tok, _expand_path(args[i + 1])]
-            i += 2
-        elif tok in _ONE_ARG_FLAGS and i + 1 < len(args):
-            other += [tok, _expand_path(args[i + 1])]
+        elif kind is not None and i + 1 < n:
+            buckets[kind].extend((tok, _expand_path(args[i + 1])))
             i += 2
         else:
             other.append(tok)
@@ -112,42 +119,52 @@ def build_bwrap_command(
             run_cmd = ["/usr/bin/env", "uv"]
 
     cmd: List[str] = ["bwrap"]
+    # Extending with small tuples avoids building a temporary list (and the
+    # ``+=`` rebinding) for every emitted flag.
+    extend = cmd.extend
 
-    namespace, dirs, late, other = _categorise_args(config.get("args") or [])
+    namespace, dirs, late, other = _categorise_args(config.get("args") or _EMPTY)
 
     # 1. Namespace flags
-    cmd += namespace
+    extend(namespace)
 
     # 2. Base filesystem mounts (tmpfs)
     for path in _as_list(config.get("tmpfs")):
-        cmd += ["--tmpfs", path]
+        extend((_TMPFS, path))
 
     # 3. Directory creation
-    cmd += dirs
+    extend(dirs)
 
     # 4. Bind mounts
-    for mount in config.get("mounts") or []:
+    for mount in config.get("mounts") or _EMPTY:
         host = _expand_path(mount.get("host") or "")
         container = _expand_path(mount.get("container") or "")
         if not host or not container:
             continue
-        mode = str(mount.get("mode", "rw")).lower()
-        flag = "--ro-bind" if mode in _RO_MODES else "--bind"
-        cmd += [flag, host, container]
+        mode = mount.get("mode", "rw")
+        is_ro = _MODE_IS_RO.get(mode) if type(mode) is str else None
+        if is_ro is None:
+            # Hand-built profiles may carry e.g. "RO"; normalise on the slow path.
+            is_ro = str(mode).lower() in _RO_MODES
+        flag = _RO_BIND if is_ro else _BIND
+        extend((flag, host, container))
 
     # 5. Special filesystems (dev, proc)
     for path in _as_list(config.get("dev")):
-        cmd += ["--dev", path]
+        extend((_DEV, path))
     for path in _as_list(config.get("proc")):
-        cmd += ["--proc", path]
+        extend((_PROC, path))
 
     # 6. Environment variables
-    for key, value in (config.get("env") or {}).items():
-        cmd += ["--setenv", key, str(value)]
+    env = config.get("env")
+    if env:
+        for key, value in env.items():
+            extend((_SETENV, key, str(value)))
 
     # 7. Other args, then late args
-    cmd += other
-    cmd += late
+    extend(other)
+    extend(late)
 
-    cmd += ["--"] + run_cmd
+    cmd.append(_DOUBLE_DASH)
+    extend(run_cmd)
     return cmd
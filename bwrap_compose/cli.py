@@ -1,32 +1,31 @@
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from pathlib import Path
-import json
 import os
 import re
 import shlex
-import subprocess
+import stat
 import typer
 
-try:
-    import yaml as _yaml
-except ImportError:
-    _yaml = None
-
 from .config import load_profile, validate_profile
 from .composer import compose_profiles
 from .builder import build_bwrap_command
-from .parser import parse_bwrap_command
-from .conflicts import detect_conflicts
-from .manifest import manifest_from_binary
+
+# Modules only some commands need (subprocess, json, yaml, .parser,
+# .conflicts, .manifest) are imported inside those commands to keep
+# start-up cheap.
 
 app = typer.Typer(help="Compose bubblewrap profiles into a single bwrap command")
 
 _ENV_VAR_RE = re.compile(r'^(\$\{?\w+\}?|~)(/.+)?$')
 
+# Tokens made only of these characters need no quoting (same set as shlex).
+_SAFE_RE = re.compile(r'\A[A-Za-z0-9@%+=:,./_-]+\Z')
+
 
 def _shell_quote(s: str) -> str:
     """Quote *s* for shell, but leave ``$VAR`` and ``~/`` references unquoted."""
-    if _ENV_VAR_RE.match(s):
+    if _SAFE_RE.match(s) or _ENV_VAR_RE.match(s):
         return s
     return shlex.quote(s)
 
@@ -37,6 +36,52 @@ _BUILTIN_PROFILE_DIR = Path(__file__).resolve().parents[1] / "examples" / "profi
 _PROFILE_EXTENSIONS = (".yaml", ".yml", ".json")
 
 
+def _stat_or_none(path) -> Optional[os.stat_result]:
+    """Return ``os.stat(path)`` or None if it does not exist."""
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+# Directory listings keyed by path, with the directory's mtime at listing
+# time; adding or removing an entry bumps the mtime and forces a re-scan.
+_DIR_INDEX: Dict[str, Tuple[int, FrozenSet[str]]] = {}
+
+
+def _dir_entries(directory: str) -> FrozenSet[str]:
+    """Return the entry names in *directory* (empty if it cannot be listed).
+
+    One ``scandir`` per directory means only names present in it are
+    ``stat``-ed; later calls only ``stat`` the directory to check the
+    listing is current.
+    """
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+        cached = _DIR_INDEX.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        with os.scandir(directory) as it:
+            names = frozenset(entry.name for entry in it)
+    except OSError:
+        return frozenset()
+    _DIR_INDEX[directory] = (mtime, names)
+    return names
+
+
+def _write_script(out: Path, cmd_str: str) -> None:
+    """Write an executable ``sh`` wrapper that execs *cmd_str* to *out*."""
+    data = ("#!/usr/bin/env sh\nexec " + cmd_str + "\n").encode()
+    fd = os.open(out, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+    try:
+        # The open() mode is subject to umask and ignored for existing files.
+        os.fchmod(fd, 0o755)
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
 def _resolve_profile_path(
     name: str,
     extra_dirs: Optional[List[Path]] = None,
@@ -50,16 +95,29 @@ def _resolve_profile_path(
 
     Raises :class:`typer.Exit` when the profile cannot be found.
     """
-    path = Path(name)
-    if path.exists():
-        return path
+    # A single stat; directories that happen to share a profile's name are
+    # not mistaken for profile files, while FIFOs and ``/dev/stdin`` (process
+    # substitution) are accepted.
+    st = _stat_or_none(name)
+    if st is not None and not stat.S_ISDIR(st.st_mode):
+        return Path(name)
 
     search_dirs: List[Path] = list(extra_dirs or []) + [_BUILTIN_PROFILE_DIR]
 
+    # A directory listing only holds direct children, so names with a
+    # sub-path (``sub/p``) skip it and stat every candidate.  Either way a
+    # candidate must be a regular file: directories and dangling symlinks
+    # must not shadow a profile in a later directory.
+    nested = os.sep in name or (os.altsep is not None and os.altsep in name)
     for directory in search_dirs:
+        names = None if nested else _dir_entries(str(directory))
         for ext in _PROFILE_EXTENSIONS:
-            candidate = directory / f"{name}{ext}"
-            if candidate.exists():
+            filename = f"{name}{ext}"
+            if names is not None and filename not in names:
+                continue
+            candidate = directory / filename
+            st = _stat_or_none(candidate)
+            if st is not None and stat.S_ISREG(st.st_mode):
                 return candidate
 
     searched = ", ".join(str(d) for d in search_dirs)
@@ -71,6 +129,8 @@ def _resolve_profile_path(
 
 def _handle_conflicts(profile_dicts, merged, interactive=False):
     """Detect and optionally prompt about conflicts. Returns True to proceed."""
+    from .conflicts import detect_conflicts
+
     found = detect_conflicts(profile_dicts, merged)
     if not found:
         return True
@@ -112,6 +172,9 @@ def combine(
         None, "--check-conflicts",
         help="Conflict checking mode: 'warn' (print warnings), 'prompt' (interactive), or 'error' (abort on conflicts)",
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Re-parse profiles, bypassing the in-memory and (opt-in) disk parse caches",
+    ),
 ):
     """Combine one or more profile files/names into a single bwrap command.
 
@@ -121,7 +184,10 @@ def combine(
     extra_dirs = [Path(d) for d in config_dir] if config_dir else []
 
     profile_dicts = [
-        load_profile(str(_resolve_profile_path(p, extra_dirs=extra_dirs)))
+        load_profile(
+            str(_resolve_profile_path(p, extra_dirs=extra_dirs)),
+            use_cache=not no_cache,
+        )
         for p in profiles
     ]
 
@@ -134,18 +200,20 @@ def combine(
 
     run_cmd = shlex.split(command) if command else None
     cmd_list = build_bwrap_command(merged, run_cmd=run_cmd)
-    cmd_str = " ".join(_shell_quote(a) for a in cmd_list)
+    # Quoting is only needed for printed/scripted output, not for --run.
+    if dry_run or output_script:
+        cmd_str = " ".join([_shell_quote(a) for a in cmd_list])
 
-    if dry_run:
-        typer.echo(cmd_str)
+        if dry_run:
+            typer.echo(cmd_str)
 
-    if output_script:
-        out = Path(output_script)
-        out.write_text("#!/usr/bin/env sh\nexec " + cmd_str + "\n")
-        out.chmod(0o755)
-        typer.echo(f"Wrote script to {out}")
+        if output_script:
+            out = Path(output_script)
+            _write_script(out, cmd_str)
+            typer.echo(f"Wrote script to {out}")
 
     if run:
+        import subprocess
         subprocess.run([os.path.expandvars(os.path.expanduser(a)) for a in cmd_list])
 
 
@@ -184,6 +252,8 @@ def merge_commands(
         typer.echo("At least two bwrap commands are required.", err=True)
         raise typer.Exit(code=2)
 
+    from .parser import parse_bwrap_command
+
     profiles = [parse_bwrap_command(c) for c in commands]
     merged = compose_profiles(profiles)
 
@@ -194,18 +264,20 @@ def merge_commands(
 
     run_cmd = shlex.split(command) if command else None
     cmd_list = build_bwrap_command(merged, run_cmd=run_cmd)
-    cmd_str = " ".join(_shell_quote(a) for a in cmd_list)
+    # Quoting is only needed for printed/scripted output, not for --run.
+    if dry_run or output_script:
+        cmd_str = " ".join([_shell_quote(a) for a in cmd_list])
 
-    if dry_run:
-        typer.echo(cmd_str)
+        if dry_run:
+            typer.echo(cmd_str)
 
-    if output_script:
-        out = Path(output_script)
-        out.write_text("#!/usr/bin/env sh\nexec " + cmd_str + "\n")
-        out.chmod(0o755)
-        typer.echo(f"Wrote script to {out}")
+        if output_script:
+            out = Path(output_script)
+            _write_script(out, cmd_str)
+            typer.echo(f"Wrote script to {out}")
 
     if run:
+        import subprocess
         subprocess.run([os.path.expandvars(os.path.expanduser(a)) for a in cmd_list])
 
 
@@ -216,6 +288,9 @@ def validate(
         None, "--config-dir", "-C",
         help="Additional directory to search for profile YAML files",
     ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Re-parse profiles, bypassing the in-memory and (opt-in) disk parse caches",
+    ),
 ):
     """Validate one or more profile files for schema correctness."""
     extra_dirs = [Path(d) for d in config_dir] if config_dir else []
@@ -223,7 +298,7 @@ def validate(
 
     for p in profiles:
         path = _resolve_profile_path(p, extra_dirs=extra_dirs)
-        data = load_profile(str(path), search_dirs=extra_dirs)
+        data = load_profile(str(path), search_dirs=extra_dirs, use_cache=not no_cache)
         errors = validate_profile(data)
         if errors:
             has_errors = True
@@ -250,10 +325,10 @@ def list_profiles(
 
     seen = set()
     for d in dirs:
-        if not d.is_dir():
-            continue
+        entries = _dir_entries(str(d))
         for ext in _PROFILE_EXTENSIONS:
-            for f in sorted(d.glob(f"*{ext}")):
+            for fname in sorted(e for e in entries if e.endswith(ext)):
+                f = d / fname
                 name = f.stem
                 if name not in seen:
                     seen.add(name)
@@ -263,18 +338,33 @@ def list_profiles(
         typer.echo("No profiles found.")
 
 
+def _dump_profile(profile) -> str:
+    """Serialise *profile* as YAML, or JSON when PyYAML is unavailable."""
+    try:
+        import yaml
+    except ImportError:
+        import json
+        return json.dumps(profile, indent=2) + "\n"
+    return yaml.dump(profile, default_flow_style=False, sort_keys=False)
+
+
+# Flags that from-command lifts out of ``args`` into their own profile keys.
+_SPECIAL_MOUNT_KEYS = {"--tmpfs": "tmpfs", "--dev": "dev", "--proc": "proc"}
+
+
 def _extract_special_mounts(profile):
     """Move --tmpfs/--dev/--proc entries from *args* into dedicated profile keys."""
-    args = list(profile.get("args") or [])
-    _special = {"--tmpfs": "tmpfs", "--dev": "dev", "--proc": "proc"}
+    args = profile.get("args") or []
+    n = len(args)
+    special_get = _SPECIAL_MOUNT_KEYS.get
     new_args = []
-    extracted = {}
+    extracted = defaultdict(list)
 
     i = 0
-    while i < len(args):
-        if args[i] in _special and i + 1 < len(args):
-            key = _special[args[i]]
-            extracted.setdefault(key, []).append(args[i + 1])
+    while i < n:
+        key = special_get(args[i])
+        if key is not None and i + 1 < n:
+            extracted[key].append(args[i + 1])
             i += 2
         else:
             new_args.append(args[i])
@@ -299,6 +389,8 @@ def from_command(
 
         bwrapc from-command "bwrap --ro-bind / / --setenv A 1 -- /bin/sh"
     """
+    from .parser import parse_bwrap_command
+
     profile = parse_bwrap_command(command)
     profile = _extract_special_mounts(profile)
 
@@ -310,10 +402,7 @@ def from_command(
         if val:
             cleaned[key] = val
 
-    if _yaml is not None:
-        text = _yaml.dump(cleaned, default_flow_style=False, sort_keys=False)
-    else:
-        text = json.dumps(cleaned, indent=2) + "\n"
+    text = _dump_profile(cleaned)
 
     if output:
         out = Path(output)
@@ -344,6 +433,8 @@ def from_binary(
         bwrapc from-binary grep
         bwrapc from-binary /usr/bin/grep -o tools/grep.yaml
     """
+    from .manifest import manifest_from_binary
+
     try:
         profile = manifest_from_binary(binary, description=description)
     except (FileNotFoundError, RuntimeError) as exc:
@@ -358,10 +449,7 @@ def from_binary(
         if val:
             cleaned[key] = val
 
-    if _yaml is not None:
-        text = _yaml.dump(cleaned, default_flow_style=False, sort_keys=False)
-    else:
-        text = json.dumps(cleaned, indent=2) + "\n"
+    text = _dump_profile(cleaned)
 
     if output:
         out = Path(output)
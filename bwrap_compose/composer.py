@@ -1,98 +1,125 @@
-from typing import Dict, Any, List, Tuple, Set
-
-# Flags that take exactly one argument — must be kept as (flag, value) pairs.
-_ONE_ARG_FLAGS: Set[str] = {
-    "--unsetenv", "--chdir", "--tmpfs", "--dir", "--proc", "--dev",
-    "--remount-ro", "--uid", "--gid", "--hostname", "--lock-file",
-    "--file", "--bind-data", "--ro-bind-data", "--perms", "--size", "--chmod",
+from functools import lru_cache
+from typing import Dict, Any, List, Sequence, Tuple, Set
+
+from ._flag_tables import DIR_FLAGS, FLAG_ARITY, LATE_FLAGS, ZERO_ARG_FLAGS
+
+# Immutable stand-in for missing or ``None`` list-valued profile keys.
+_EMPTY: Tuple[Any, ...] = ()
+
+# flag → (category, number of values).  Built once so grouping and ordering
+# need a single dict lookup per token; unknown tokens are ("other", 0).
+_FLAG_INFO: Dict[str, Tuple[str, int]] = {
+    flag: (
+        "ns" if flag in ZERO_ARG_FLAGS
+        else "dir" if flag in DIR_FLAGS
+        else "late" if flag in LATE_FLAGS
+        else "other",
+        arity,
+    )
+    for flag, arity in FLAG_ARITY.items()
 }
 
-# Flags that take exactly two arguments (key+value or src+dest style).
-_TWO_ARG_FLAGS: Set[str] = {
-    "--setenv", "--symlink",
-    "--bind", "--bind-try", "--dev-bind", "--dev-bind-try",
-    "--ro-bind", "--ro-bind-try",
-}
+_UNKNOWN_FLAG: Tuple[str, int] = ("other", 0)
 
-# Zero-arg namespace / session flags.
-_NAMESPACE_FLAGS: Set[str] = {
-    "--unshare-user", "--unshare-user-try", "--unshare-ipc",
-    "--unshare-pid", "--unshare-net", "--unshare-uts",
-    "--unshare-cgroup", "--unshare-cgroup-try", "--unshare-all",
-    "--share-net", "--die-with-parent", "--as-pid-1",
-    "--new-session", "--clearenv",
-}
 
-# One-arg flags that create directories (emitted after tmpfs, before mounts).
-_DIR_FLAGS: Set[str] = {"--dir"}
+def _split_groups(args: Sequence[str]) -> List[Tuple[Tuple[str, ...], str]]:
+    """Split *args* into ``(group, category)`` pairs.
+
+    A flag whose values are missing (truncated args) becomes a lone 1-tuple
+    in the ``other`` category, like an unknown token.
+    """
+    out: List[Tuple[Tuple[str, ...], str]] = []
+    info_get = _FLAG_INFO.get
+    n = len(args)
+    i = 0
+    while i < n:
+        category, arity = info_get(args[i], _UNKNOWN_FLAG)
+        if arity and i + arity < n:
+            out.append((tuple(args[i:i + 1 + arity]), category))
+            i += 1 + arity
+        else:
+            out.append(((args[i],), category if not arity else "other"))
+            i += 1
+    return out
 
-# One-arg flags emitted late (after mounts).
-_LATE_FLAGS: Set[str] = {"--chdir"}
 
+@lru_cache(maxsize=512)
+def _split_groups_cached(
+    args: Tuple[str, ...],
+) -> Tuple[Tuple[Tuple[str, ...], str], ...]:
+    """Memoised :func:`_split_groups` keyed on the args tuple."""
+    return tuple(_split_groups(args))
 
-def _group_args(args: List[str]) -> List[Tuple[str, ...]]:
+
+def _classified_groups(
+    args: Sequence[str],
+) -> Sequence[Tuple[Tuple[str, ...], str]]:
+    """Return (cached) ``(group, category)`` pairs for *args*."""
+    if not args:
+        return _EMPTY
+    return _split_groups_cached(tuple(args))
+
+
+def _group_args(args: Sequence[str]) -> List[Tuple[str, ...]]:
     """Group raw bwrap args into logical tuples for deduplication.
 
     Zero-arg flags become 1-tuples, one-arg flags become 2-tuples,
     two-arg flags become 3-tuples, and unrecognised tokens become 1-tuples.
     """
-    groups: List[Tuple[str, ...]] = []
-    i = 0
-    while i < len(args):
-        if args[i] in _TWO_ARG_FLAGS and i + 2 < len(args):
-            groups.append((args[i], args[i + 1], args[i + 2]))
-            i += 3
-        elif args[i] in _ONE_ARG_FLAGS and i + 1 < len(args):
-            groups.append((args[i], args[i + 1]))
-            i += 2
-        else:
-            groups.append((args[i],))
-            i += 1
-    return groups
+    return [group for group, _ in _classified_groups(args)]
 
 
-def _organize_args(args: List[str]) -> List[str]:
-    """Sort merged args into a consistent order by category.
+def _new_buckets() -> Dict[str, List[Tuple[str, ...]]]:
+    return {"ns": [], "dir": [], "other": [], "late": []}
 
-    Order: namespace flags, dir flags, other flags, late flags.
-    """
-    namespace: List[str] = []
-    dirs: List[Tuple[str, str]] = []
-    late: List[Tuple[str, str]] = []
-    other: List[str] = []
 
-    i = 0
-    while i < len(args):
-        tok = args[i]
-        if tok in _NAMESPACE_FLAGS:
-            namespace.append(tok)
-            i += 1
-        elif tok in _DIR_FLAGS and i + 1 < len(args):
-            dirs.append((tok, args[i + 1]))
-            i += 2
-        elif tok in _LATE_FLAGS and i + 1 < len(args):
-            late.append((tok, args[i + 1]))
-            i += 2
-        elif tok in _TWO_ARG_FLAGS and i + 2 < len(args):
-            other += [tok, args[i + 1], args[i + 2]]
-            i += 3
-        elif tok in _ONE_ARG_FLAGS and i + 1 < len(args):
-            other += [tok, args[i + 1]]
-            i += 2
-        else:
-            other.append(tok)
-            i += 1
+def _flatten_buckets(buckets: Dict[str, List[Tuple[str, ...]]]) -> List[str]:
+    """Concatenate category buckets: namespace (sorted), dir, other, late.
 
+    The namespace bucket is sorted in place.
+    """
+    ns = buckets["ns"]
+    if len(ns) > 1:
+        ns.sort()
     result: List[str] = []
-    result += sorted(namespace)
-    for flag, val in dirs:
-        result += [flag, val]
-    result += other
-    for flag, val in late:
-        result += [flag, val]
+    extend = result.extend
+    for group in ns:
+        extend(group)
+    for group in buckets["dir"]:
+        extend(group)
+    for group in buckets["other"]:
+        extend(group)
+    for group in buckets["late"]:
+        extend(group)
     return result
 
 
+def _organize_args(args: List[str]) -> List[str]:
+    """Sort merged args into a consistent order by category.
+
+    Order: namespace flags, dir flags, other flags, late flags.
+    """
+    buckets = _new_buckets()
+    for group, category in _split_groups(args):
+        buckets[category].append(group)
+    return _flatten_buckets(buckets)
+
+
+def _mount_key(mount: Dict[str, Any]) -> Any:
+    """Return a hashable key identifying *mount* by exact content."""
+    try:
+        return frozenset(mount.items())
+    except TypeError:
+        pass
+    # List values (e.g. from YAML sequences) are hashed as tuples.
+    try:
+        return frozenset(
+            (k, tuple(v) if isinstance(v, list) else v) for k, v in mount.items()
+        )
+    except TypeError:
+        return repr(sorted(mount.items(), key=repr))
+
+
 def compose_profiles(profile_dicts: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Merge multiple profile dicts into a single configuration.
 
@@ -113,19 +140,28 @@ def compose_profiles(profile_dicts: List[Dict[str, Any]]) -> Dict[str, Any]:
         "dev": [],
         "proc": [],
     }
-    seen_arg_groups: list[Tuple[str, ...]] = []
+    seen_mounts: Set[Any] = set()
+    seen_arg_groups: Set[Tuple[str, ...]] = set()
+    arg_buckets = _new_buckets()
+    seen_paths: Dict[str, Set[str]] = {"tmpfs": set(), "dev": set(), "proc": set()}
 
     for profile in profile_dicts:
-        for mount in profile.get("mounts") or []:
-            if mount not in merged["mounts"]:
+        for mount in profile.get("mounts") or _EMPTY:
+            key = _mount_key(mount)
+            if key not in seen_mounts:
+                seen_mounts.add(key)
                 merged["mounts"].append(mount)
 
-        merged["env"].update(profile.get("env") or {})
+        env = profile.get("env")
+        if env:
+            merged["env"].update(env)
 
-        for group in _group_args(profile.get("args") or []):
+        # De-duplicate and sort into category buckets in the same pass, so
+        # the merged args never need re-tokenising.
+        for group, category in _classified_groups(profile.get("args") or _EMPTY):
             if group not in seen_arg_groups:
-                seen_arg_groups.append(group)
-                merged["args"].extend(group)
+                seen_arg_groups.add(group)
+                arg_buckets[category].append(group)
 
         if "run" in profile:
             merged["run"] = profile["run"]
@@ -133,10 +169,12 @@ def compose_profiles(profile_dicts: List[Dict[str, Any]]) -> Dict[str, Any]:
         for key in ("tmpfs", "dev", "proc"):
             val = profile.get(key)
             if val is not None:
-                items = [val] if isinstance(val, str) else (val or [])
+                items = [val] if isinstance(val, str) else (val or _EMPTY)
+                seen = seen_paths[key]
                 for item in items:
-                    if item not in merged[key]:
+                    if item not in seen:
+                        seen.add(item)
                         merged[key].append(item)
 
-    merged["args"] = _organize_args(merged["args"])
+    merged["args"] = _flatten_buckets(arg_buckets)
     return merged
@@ -1,81 +1,304 @@
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import copy
 import json
+import os
+import stat
+import sys
 
-try:
-    import yaml  # type: ignore
-    _yaml_safe_load = yaml.safe_load
-    _yaml_dump = yaml.dump
-except ImportError:
-    _yaml_safe_load = None
-    _yaml_dump = None
 
+@lru_cache(maxsize=None)
+def _yaml_loader() -> Any:
+    """Return the fastest available safe YAML loader class, or None.
 
-def _parse_text(text: str) -> Any:
-    """Parse YAML or JSON text, preferring YAML when available."""
-    if _yaml_safe_load:
-        return _yaml_safe_load(text)
+    PyYAML is imported on first use so that commands which never parse YAML
+    do not pay for it.  The libyaml-backed ``CSafeLoader`` is preferred; it is
+    several times faster than the pure-Python ``SafeLoader``.
+    """
+    try:
+        import yaml  # type: ignore
+    except ImportError:
+        return None
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=None)
+def _orjson_loads() -> Optional[Callable[[str], Any]]:
+    """Return ``orjson.loads`` if orjson is installed, else None."""
+    try:
+        import orjson  # type: ignore
+    except ImportError:
+        return None
+    return orjson.loads
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON *text*, using orjson when it is available."""
+    fast = _orjson_loads()
+    if fast is not None:
+        try:
+            return fast(text)
+        except ValueError:
+            # orjson is stricter (no NaN/Infinity, 64-bit ints); let the
+            # stdlib parser accept or reject the document as before.
+            pass
     return json.loads(text)
 
 
+def _parse_text(text: str, suffix: str = "") -> Any:
+    """Parse YAML or JSON text, preferring YAML when available.
+
+    ``.json`` files (by *suffix*) go straight to the JSON parser, which is
+    much faster than any YAML loader on the same content.
+    """
+    if suffix == ".json":
+        return _json_loads(text)
+    loader = _yaml_loader()
+    if loader is not None:
+        import yaml  # type: ignore
+        return yaml.load(text, Loader=loader)
+    return _json_loads(text)
+
+
+# Parsed (and unwrapped) profile data keyed by (resolved path, mtime, size).
+# Optionally backed by a JSON cache under ``$XDG_CACHE_HOME/bwrap_compose``
+# so that separate CLI invocations also skip re-parsing unchanged files.
+_PARSE_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+# The disk cache is a second source of sandbox policy, so it is opt-in.
+_DISK_CACHE_ENV = "BWRAP_COMPOSE_DISK_CACHE"
+
+
+def clear_profile_cache() -> None:
+    """Drop all cached profile parses."""
+    _PARSE_CACHE.clear()
+
+
+def _disk_cache_enabled() -> bool:
+    """Return True if ``$BWRAP_COMPOSE_DISK_CACHE`` opts in to the disk cache."""
+    return os.environ.get(_DISK_CACHE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def _private(st: os.stat_result) -> bool:
+    """Return True if *st* is owned by us with no group/other permissions."""
+    return st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def _disk_cache_dir() -> Path:
+    """Return the directory used for the persistent parse cache."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "bwrap_compose"
+
+
+def _disk_cache_path(real: str) -> Path:
+    # Only needed when the opt-in disk cache is enabled.
+    import hashlib
+
+    digest = hashlib.blake2b(
+        real.encode("utf-8", "surrogateescape"), digest_size=16
+    ).hexdigest()
+    return _disk_cache_dir() / f"{digest}.json"
+
+
+def _read_disk_cache(real: str, st: os.stat_result) -> Optional[Dict[str, Any]]:
+    """Return the cached parse of *real* if it is still fresh, else None.
+
+    Entries in a directory or file that another user could have written
+    are ignored.
+    """
+    target = _disk_cache_path(real)
+    try:
+        if not _private(os.stat(target.parent)):
+            return None
+        with open(target, "rb") as fh:
+            if not _private(os.fstat(fh.fileno())):
+                return None
+            entry = json.loads(fh.read())
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(entry, dict)
+        or entry.get("path") != real
+        or entry.get("mtime_ns") != st.st_mtime_ns
+        or entry.get("size") != st.st_size
+    ):
+        return None
+    return entry.get("data")
+
+
+def _write_disk_cache(real: str, st: os.stat_result, data: Dict[str, Any]) -> None:
+    """Best-effort atomic write of *data* to the persistent cache."""
+    import tempfile
+
+    try:
+        payload = json.dumps({
+            "path": real,
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "data": data,
+        })
+    except (TypeError, ValueError):
+        return
+    # YAML can yield values JSON cannot round-trip (e.g. int mapping keys);
+    # only cache profiles that come back unchanged.
+    if json.loads(payload)["data"] != data:
+        return
+    target = _disk_cache_path(real)
+    try:
+        target.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # mkstemp creates the file with mode 0600.
+        fd, tmp = tempfile.mkstemp(dir=str(target.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fh:
+                fh.write(payload)
+            os.replace(tmp, target)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass
+
+
 def _unwrap_profiles(data: Dict[str, Any]) -> Dict[str, Any]:
     """If *data* has a single-entry ``profiles`` wrapper, unwrap it."""
-    if isinstance(data, dict) and isinstance(data.get("profiles"), dict):
-        profiles = data["profiles"]
-        if len(profiles) == 1:
-            return next(iter(profiles.values()))
+    profiles = data.get("profiles") if isinstance(data, dict) else None
+    if profiles is None:
+        return data
+    if isinstance(profiles, dict) and len(profiles) == 1:
+        return next(iter(profiles.values()))
+    return data
+
+
+def _normalise_profile(data: Any) -> Any:
+    """Canonicalise values in freshly parsed *data* in place.
+
+    Mount modes are lower-cased once here so the builder and conflict
+    checks can compare them directly instead of re-normalising per use.
+    Modes and ``--`` flag tokens in ``args`` are also interned, so lookups
+    in the mode and flag tables hit the identity fast path.
+    """
+    if not isinstance(data, dict):
+        return data
+    mounts = data.get("mounts")
+    if isinstance(mounts, list):
+        for m in mounts:
+            if isinstance(m, dict) and "mode" in m:
+                m["mode"] = sys.intern(str(m["mode"]).lower())
+    args = data.get("args")
+    if isinstance(args, list):
+        # Only flags: interning every path would grow the intern table.
+        data["args"] = [
+            sys.intern(a) if type(a) is str and a[:2] == "--" else a
+            for a in args
+        ]
     return data
 
 
+def _parse_file(p: Path) -> Any:
+    """Read, parse, unwrap and normalise the profile file at *p*."""
+    data = _parse_text(p.read_text(), p.suffix.lower()) or {}
+    return _normalise_profile(_unwrap_profiles(data))
+
+
+def _read_profile(p: Path, use_cache: bool) -> Dict[str, Any]:
+    """Return a fresh, mutable copy of the profile data stored at *p*."""
+    if not use_cache:
+        return _parse_file(p)
+    # Stat the path as given: resolving ``/dev/fd/N`` yields an unstattable
+    # ``pipe:[…]`` name.  Pipes and devices have no stable mtime/size, so
+    # only regular files go through either cache layer.
+    st = os.stat(p)
+    if not stat.S_ISREG(st.st_mode):
+        return _parse_file(p)
+    real = str(p.resolve())
+    key = (real, st.st_mtime_ns, st.st_size)
+    cached = _PARSE_CACHE.get(key)
+    if cached is None:
+        disk = _disk_cache_enabled()
+        cached = _read_disk_cache(real, st) if disk else None
+        if cached is not None:
+            # JSON decoding yields fresh strings; re-intern them.
+            _normalise_profile(cached)
+        else:
+            cached = _parse_file(p)
+            if disk:
+                _write_disk_cache(real, st, cached)
+        _PARSE_CACHE[key] = cached
+    # Callers (and the extends merge) mutate the result; hand out a copy.
+    return copy.deepcopy(cached)
+
+
 def load_profile(
     path: str,
     *,
     search_dirs: Optional[List[Path]] = None,
-    _visited: Optional[Set[str]] = None,
+    use_cache: bool = True,
 ) -> Dict[str, Any]:
     """Load a profile YAML/JSON file.
 
     Supports an ``extends`` key (string or list of strings) that names parent
     profiles to inherit from.  Parent profiles are resolved relative to the
-    same directory as *path* and any directories in *search_dirs*.
+    directory of the profile that names them and any directories in
+    *search_dirs*.  A parent shared by several profiles in the hierarchy is
+    loaded once.
+
+    Parsed files are cached in memory, keyed by path and invalidated by
+    mtime/size; setting ``$BWRAP_COMPOSE_DISK_CACHE=1`` also caches them on
+    disk.  Pass ``use_cache=False`` to always re-parse.
 
     Raises:
         FileNotFoundError: If *path* does not exist.
         ValueError: If the file cannot be parsed or a cycle is detected.
     """
-    if _visited is None:
-        _visited = set()
-
-    real = str(Path(path).resolve())
-    if real in _visited:
-        raise ValueError(f"Circular extends detected: {real}")
-    _visited.add(real)
+    from .composer import compose_profiles
 
-    p = Path(path)
-    text = p.read_text()
-    data = _parse_text(text) or {}
-    data = _unwrap_profiles(data)
+    # Fully merged profiles, by resolved path.
+    done: Dict[str, Dict[str, Any]] = {}
+    # Profiles on the current extends chain; meeting one again is a cycle.
+    active: Set[str] = set()
+    # Depth-first walk with an explicit stack.  Each frame is
+    # [resolved path, path, own data, parent names, next parent, parent paths].
+    stack: List[List[Any]] = []
 
-    extends = data.pop("extends", None)
-    if extends:
+    def enter(p: Path) -> None:
+        real = str(p.resolve())
+        if real in active:
+            raise ValueError(f"Circular extends detected: {real}")
+        data = _read_profile(p, use_cache)
+        extends = data.pop("extends", None) or []
         if isinstance(extends, str):
             extends = [extends]
-        parent_dicts = []
-        for parent_name in extends:
-            parent_path = _resolve_extends(parent_name, p.parent, search_dirs)
+        active.add(real)
+        stack.append([real, p, data, extends, 0, []])
+
+    root = Path(path)
+    enter(root)
+    while stack:
+        frame = stack[-1]
+        real, p, data, extends, i, parents = frame
+        if i < len(extends):
+            frame[4] = i + 1
+            parent_path = _resolve_extends(extends[i], p.parent, search_dirs)
             if parent_path is None:
                 raise FileNotFoundError(
-                    f"Extended profile '{parent_name}' not found from {path}"
+                    f"Extended profile '{extends[i]}' not found from {p}"
                 )
-            parent_dicts.append(
-                load_profile(str(parent_path), search_dirs=search_dirs, _visited=_visited)
-            )
-        # Merge parents first, then overlay current profile.
-        from .composer import compose_profiles
-        base = compose_profiles(parent_dicts)
-        data = compose_profiles([base, data])
+            parent_real = str(parent_path.resolve())
+            parents.append(parent_real)
+            if parent_real not in done:
+                enter(parent_path)
+            continue
 
-    return data
+        stack.pop()
+        active.discard(real)
+        if parents:
+            # Merge parents first, then overlay the profile itself.
+            base = compose_profiles([done[r] for r in parents])
+            data = compose_profiles([base, data])
+        done[real] = data
+
+    return done[str(root.resolve())]
 
 
 def _resolve_extends(
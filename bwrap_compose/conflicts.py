@@ -8,8 +8,13 @@ Conflicts include:
 """
 
 from dataclasses import dataclass, field
-from pathlib import PurePosixPath
-from typing import Any, Dict, List, Optional
+from itertools import groupby
+from operator import itemgetter
+import posixpath
+from typing import Any, Dict, List, Optional, Tuple
+
+# Default for absent ``mounts``/``args`` keys.
+_EMPTY: Tuple[Any, ...] = ()
 
 
 @dataclass
@@ -30,92 +35,120 @@ def detect_conflicts(
     Returns a list of :class:`Conflict` objects.  An empty list means no
     conflicts were found.
     """
+    # Normalise every mount once and share the rows between the mount checks.
+    rows = _preprocess_mounts(profiles)
+    if merged is None:
+        merged = _quick_merge(profiles)
+        merged_rows = rows
+    else:
+        merged_rows = _preprocess_mounts([merged])
+
     conflicts: List[Conflict] = []
-    conflicts.extend(_check_mount_mode_conflicts(profiles))
-    conflicts.extend(_check_ro_writable_subdir(merged or _quick_merge(profiles)))
+    conflicts.extend(_check_mount_mode_conflicts(rows))
+    conflicts.extend(_check_ro_writable_subdir(merged_rows))
     conflicts.extend(_check_env_overrides(profiles))
-    conflicts.extend(_check_namespace_contradictions(merged or _quick_merge(profiles)))
+    conflicts.extend(_check_namespace_contradictions(merged))
     return conflicts
 
 
 # ── helpers ──────────────────────────────────────────────────────────────
 
+# Canonical modes (as stored by load_profile) map without re-normalising.
+_CANONICAL_MODES: Dict[str, str] = {"ro": "ro", "readonly": "ro", "rw": "rw"}
+
+
 def _normalise_mode(mode: str) -> str:
+    canon = _CANONICAL_MODES.get(mode) if type(mode) is str else None
+    if canon is not None:
+        return canon
     m = str(mode).lower()
     return "ro" if m in ("ro", "readonly") else "rw"
 
 
+# (container path, normalised mode, is read-only) for one mount.
+_MountRow = Tuple[str, str, bool]
+
+
+def _preprocess_mounts(profiles: List[Dict[str, Any]]) -> List[_MountRow]:
+    """Flatten the mounts of *profiles* into normalised rows, in order."""
+    rows: List[_MountRow] = []
+    for p in profiles:
+        for m in p.get("mounts") or _EMPTY:
+            mode = _normalise_mode(m.get("mode", "rw"))
+            rows.append((str(m.get("container", "")), mode, mode == "ro"))
+    return rows
+
+
 def _quick_merge(profiles: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Lightweight merge for conflict detection (avoids circular import)."""
-    mounts: List[Dict[str, str]] = []
-    env: Dict[str, str] = {}
+    """Lightweight merge for conflict detection (avoids circular import).
+
+    Only ``args`` are collected; mounts are handled via
+    :func:`_preprocess_mounts` and env overrides are checked per profile.
+    """
     args: List[str] = []
     for p in profiles:
-        mounts.extend(p.get("mounts") or [])
-        env.update(p.get("env") or {})
-        args.extend(p.get("args") or [])
-    return {"mounts": mounts, "env": env, "args": args}
+        args.extend(p.get("args") or _EMPTY)
+    return {"args": args}
 
 
-def _check_mount_mode_conflicts(profiles: List[Dict[str, Any]]) -> List[Conflict]:
+def _check_mount_mode_conflicts(rows: List[_MountRow]) -> List[Conflict]:
     """Flag container paths that appear with both ro and rw modes."""
-    # Collect (container_path → set of modes) across all profiles.
-    path_modes: Dict[str, set] = {}
-    for p in profiles:
-        for m in p.get("mounts") or []:
-            cp = m.get("container", "")
-            mode = _normalise_mode(m.get("mode", "rw"))
-            path_modes.setdefault(cp, set()).add(mode)
+    # Sort (container_path, mode) pairs so each path's modes are adjacent and
+    # ordered; a path is conflicting iff its first and last modes differ.
+    pairs = sorted((cp, mode) for cp, mode, _ in rows)
 
     conflicts: List[Conflict] = []
-    for cp, modes in path_modes.items():
-        if len(modes) > 1:
+    for cp, group in groupby(pairs, key=itemgetter(0)):
+        modes = [mode for _, mode in group]
+        if modes[0] != modes[-1]:
             conflicts.append(Conflict(
                 kind="mount-mode",
                 description=(
                     f"Container path '{cp}' is mounted with conflicting modes: "
-                    f"{', '.join(sorted(modes))}. The last mount will take effect."
+                    f"{', '.join(sorted(set(modes)))}. The last mount will take effect."
                 ),
             ))
     return conflicts
 
 
-def _check_ro_writable_subdir(merged: Dict[str, Any]) -> List[Conflict]:
+def _check_ro_writable_subdir(rows: List[_MountRow]) -> List[Conflict]:
     """Flag writable mount points nested under a read-only parent."""
-    mounts = merged.get("mounts") or []
     ro_paths = set()
     rw_paths = set()
-    for m in mounts:
-        cp = m.get("container", "")
-        mode = _normalise_mode(m.get("mode", "rw"))
-        if mode == "ro":
+    for cp, _, is_ro in rows:
+        if is_ro:
             ro_paths.add(cp)
         else:
             rw_paths.add(cp)
 
+    # Read-only mounts keyed by normalised "dir/" prefix, so "/a/b" matches
+    # "/a" but "/ab" does not.  The keys act as a flattened path trie: each
+    # proper ancestor of a writable path is one dict lookup, instead of a
+    # comparison against every read-only mount.
+    ro_by_prefix = {_dir_prefix(p): p for p in ro_paths}
+    ro_get = ro_by_prefix.get
+
     conflicts: List[Conflict] = []
-    for rw in rw_paths:
-        rw_posix = PurePosixPath(rw)
-        for ro in ro_paths:
-            ro_posix = PurePosixPath(ro)
-            if rw_posix != ro_posix and _is_subpath(rw_posix, ro_posix):
+    for rw in sorted(rw_paths):
+        rw_n = _dir_prefix(rw)
+        end = rw_n.rfind("/", 0, len(rw_n) - 1)
+        while end >= 0:
+            ro = ro_get(rw_n[:end + 1])
+            if ro is not None:
                 conflicts.append(Conflict(
                     kind="ro-writable-subdir",
                     description=(
-                        f"Writable mount '{rw}' is nested under read-only mount '{ro}'. "
-                        f"Ensure this is intentional."
+                        f"Writable mount '{rw}' is nested under read-only mount "
+                        f"'{ro}'. Ensure this is intentional."
                     ),
                 ))
+            end = rw_n.rfind("/", 0, end)
     return conflicts
 
 
-def _is_subpath(child: PurePosixPath, parent: PurePosixPath) -> bool:
-    """Return True if *child* is a strict sub-path of *parent*."""
-    try:
-        child.relative_to(parent)
-        return True
-    except ValueError:
-        return False
+def _dir_prefix(path: str) -> str:
+    """Normalise *path* to a ``/``-terminated prefix for sub-path tests."""
+    return posixpath.normpath(path).rstrip("/") + "/"
 
 
 def _check_env_overrides(profiles: List[Dict[str, Any]]) -> List[Conflict]:
@@ -123,13 +156,17 @@ def _check_env_overrides(profiles: List[Dict[str, Any]]) -> List[Conflict]:
     seen: Dict[str, str] = {}  # key → first value
     conflicts: List[Conflict] = []
     for p in profiles:
-        for k, v in (p.get("env") or {}).items():
-            v_str = str(v)
-            if k in seen and seen[k] != v_str:
+        env = p.get("env")
+        if not env:
+            continue
+        for k, v in env.items():
+            v_str = v if type(v) is str else str(v)
+            prev = seen.get(k)
+            if prev is not None and prev != v_str:
                 conflicts.append(Conflict(
                     kind="env-override",
                     description=(
-                        f"Environment variable '{k}' is set to '{seen[k]}' "
+                        f"Environment variable '{k}' is set to '{prev}' "
                         f"and later overridden to '{v_str}'."
                     ),
                     severity="warning",
@@ -138,17 +175,21 @@ def _check_env_overrides(profiles: List[Dict[str, Any]]) -> List[Conflict]:
     return conflicts
 
 
-_CONTRADICTING_NS_PAIRS = [
+# (flag, contradicting flag) pairs; checked against one set of the merged args.
+_CONTRADICTING_NS_PAIRS: Tuple[Tuple[str, str], ...] = (
     ("--unshare-net", "--share-net"),
-]
+)
 
 
 def _check_namespace_contradictions(merged: Dict[str, Any]) -> List[Conflict]:
     """Flag contradictory namespace flags (e.g. --unshare-net + --share-net)."""
-    args = set(merged.get("args") or [])
+    args = merged.get("args")
+    if not args:
+        return []
+    present = set(args)
     conflicts: List[Conflict] = []
     for a, b in _CONTRADICTING_NS_PAIRS:
-        if a in args and b in args:
+        if a in present and b in present:
             conflicts.append(Conflict(
                 kind="ns-contradiction",
                 description=(
@@ -1,12 +1,25 @@
 """Generate a bwrap profile from a binary by inspecting its linked libraries."""
 
+import copy
 import os
+import re
 import shutil
+import stat
 import subprocess
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 
+# One ldd line: "<soname> => <path> (0x…)" or a bare "<path> (0x…)" (the
+# dynamic linker).  Paths run up to the address suffix, so they may contain
+# spaces; lines without an address ("not found", statically linked) do not
+# match.
+_LDD_RE = re.compile(
+    r"^[ \t]*(?:(.+?)[ \t]+=>[ \t]+(/.+?)|(/.+?))[ \t]+\(0x[0-9a-fA-F]+\)[ \t]*$",
+    re.MULTILINE,
+)
+
+
 def _parse_ldd_output(output: str) -> Tuple[List[str], List[Tuple[str, str]]]:
     """Extract resolved library paths from ldd output.
 
@@ -17,23 +30,14 @@ def _parse_ldd_output(output: str) -> Tuple[List[str], List[Tuple[str, str]]]:
     """
     libs: List[str] = []
     symlinks: List[Tuple[str, str]] = []
-    for line in output.strip().splitlines():
-        line = line.strip()
-        if not line or "linux-vdso" in line:
+    for m in _LDD_RE.finditer(output):
+        expected, resolved = m.group(1), m.group(2) or m.group(3)
+        if "linux-vdso" in m.group(0) or not os.path.isfile(resolved):
             continue
-        if "=>" in line:
-            parts = line.split("=>")
-            expected = parts[0].strip()
-            resolved = parts[1].strip().split("(")[0].strip()
-            if resolved and os.path.isfile(resolved):
-                libs.append(resolved)
-                # If the expected path is absolute and differs, we need a symlink
-                if expected.startswith("/") and expected != resolved:
-                    symlinks.append((resolved, expected))
-        elif line.startswith("/"):
-            path = line.split("(")[0].strip()
-            if path and os.path.isfile(path):
-                libs.append(path)
+        libs.append(resolved)
+        # If the expected path is absolute and differs, we need a symlink
+        if expected and expected.startswith("/") and expected != resolved:
+            symlinks.append((resolved, expected))
     return libs, symlinks
 
 
@@ -41,13 +45,27 @@ def _collect_dirs(paths: List[str]) -> List[str]:
     """Collect the unique parent directories needed for a list of paths."""
     dirs = set()
     for p in paths:
-        parent = str(Path(p).parent)
-        while parent and parent != "/":
-            dirs.add(parent)
-            parent = str(Path(parent).parent)
+        i = p.rfind("/")
+        while i > 0:
+            d = p[:i]
+            if d in dirs:
+                # All further ancestors were added when d was first seen.
+                break
+            dirs.add(d)
+            i = d.rfind("/")
     return sorted(dirs)
 
 
+# Generated profiles (without description) keyed by (resolved binary path,
+# mtime, size), so repeated requests for the same binary skip ``ldd``.
+_MANIFEST_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
+def clear_manifest_cache() -> None:
+    """Drop all cached ``ldd``-derived manifests."""
+    _MANIFEST_CACHE.clear()
+
+
 def manifest_from_binary(
     binary: str,
     description: Optional[str] = None,
@@ -57,13 +75,33 @@ def manifest_from_binary(
     The resulting profile uses ``tmpfs /`` as a base, read-only binds the
     binary and all its shared libraries, creates necessary directories, and
     sets ``--unshare-all --die-with-parent --new-session``.
+
+    Results are cached per process, keyed by the binary's path, mtime and
+    size.
     """
     binary_path = shutil.which(binary) or binary
     binary_path = str(Path(binary_path).resolve())
 
-    if not os.path.isfile(binary_path):
+    try:
+        st = os.stat(binary_path)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         raise FileNotFoundError(f"Binary not found: {binary}")
 
+    key = (binary_path, st.st_mtime_ns, st.st_size)
+    profile = _MANIFEST_CACHE.get(key)
+    if profile is None:
+        profile = _MANIFEST_CACHE[key] = _build_manifest(binary_path)
+    # Callers may mutate the profile; never hand out the cached one.
+    profile = copy.deepcopy(profile)
+    if description:
+        profile["description"] = description
+    return profile
+
+
+def _build_manifest(binary_path: str) -> Dict[str, Any]:
+    """Run ``ldd`` on *binary_path* and build its profile."""
     result = subprocess.run(
         ["ldd", binary_path],
         capture_output=True,
@@ -108,8 +146,4 @@ def manifest_from_binary(
         "args": args,
         "run": [binary_path],
     }
-
-    if description:
-        profile["description"] = description
-
     return profile
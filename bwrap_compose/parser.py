@@ -1,66 +1,84 @@
 """Parse a bwrap command line back into a profile dict."""
 
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import re
 import shlex
 
-
-# bwrap flags that take exactly two arguments (src, dest).
-_BIND_FLAGS = {
-    "--bind",
-    "--bind-try",
-    "--dev-bind",
-    "--dev-bind-try",
-    "--ro-bind",
-    "--ro-bind-try",
-}
-
-# Flags that take exactly two arguments (key, value style).
-_TWO_ARG_FLAGS = {
-    "--setenv",
-    "--symlink",
-}
-
-# Flags that take exactly one argument.
-_ONE_ARG_FLAGS = {
-    "--unsetenv",
-    "--chdir",
-    "--tmpfs",
-    "--dir",
-    "--proc",
-    "--dev",
-    "--remount-ro",
-    "--uid",
-    "--gid",
-    "--hostname",
-    "--lock-file",
-    "--file",
-    "--bind-data",
-    "--ro-bind-data",
-    "--perms",
-    "--size",
-    "--chmod",
+from ._flag_tables import (
+    BIND_FLAGS,
+    ONE_ARG_FLAGS,
+    RO_BIND_FLAGS,
+    RW_BIND_FLAGS,
+    TWO_ARG_FLAGS,
+    ZERO_ARG_FLAGS,
+)
+
+
+# How parse_bwrap_command consumes each known flag, so the token loop needs
+# one dict lookup instead of a membership test per flag set.
+_OP_ZERO, _OP_ONE, _OP_TWO, _OP_BIND, _OP_SETENV, _OP_END = range(6)
+_FLAG_OPS: Dict[str, int] = {
+    **{f: _OP_ZERO for f in ZERO_ARG_FLAGS},
+    **{f: _OP_ONE for f in ONE_ARG_FLAGS},
+    **{f: _OP_TWO for f in TWO_ARG_FLAGS},
+    **{f: _OP_BIND for f in BIND_FLAGS},
+    "--setenv": _OP_SETENV,
+    "--": _OP_END,
 }
 
-# Flags that take zero extra arguments.
-_ZERO_ARG_FLAGS = {
-    "--unshare-user",
-    "--unshare-user-try",
-    "--unshare-ipc",
-    "--unshare-pid",
-    "--unshare-net",
-    "--unshare-uts",
-    "--unshare-cgroup",
-    "--unshare-cgroup-try",
-    "--unshare-all",
-    "--share-net",
-    "--die-with-parent",
-    "--as-pid-1",
-    "--new-session",
-    "--clearenv",
+# Profile mount mode for each bind flag.
+_BIND_MODES: Dict[str, str] = {
+    **{f: "rw" for f in RW_BIND_FLAGS},
+    **{f: "ro" for f in RO_BIND_FLAGS},
 }
 
-_RW_BIND_FLAGS = {"--bind", "--bind-try", "--dev-bind", "--dev-bind-try"}
-_RO_BIND_FLAGS = {"--ro-bind", "--ro-bind-try"}
+# Characters that need shlex's quote/escape handling.
+_QUOTING_RE = re.compile(r"[\"'\\]")
+# A token as shlex sees it when no quoting is present: a run of anything
+# but shlex's whitespace (narrower than ``str.split()``'s).
+_PLAIN_TOKEN_RE = re.compile(r"[^ \t\r\n]+")
+# Without backslashes, quotes are the only special characters: a token is a
+# run of bare text and complete '...' / "..." sections.  A quote left over
+# (group 1) is unbalanced, which shlex reports as an error.
+_QUOTED_TOKEN_RE = re.compile(r"(?:[^ \t\r\n'\"]+|'[^']*'|\"[^\"]*\")+|(['\"])")
+_QUOTED_SECTION_RE = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+
+
+def _unquote_section(m: "re.Match[str]") -> str:
+    single = m.group(1)
+    return single if single is not None else m.group(2)
+
+
+def _split_quoted(cmd: str) -> Optional[List[str]]:
+    """Split backslash-free *cmd* like shlex, or None if a quote is unbalanced."""
+    tokens = []
+    for m in _QUOTED_TOKEN_RE.finditer(cmd):
+        if m.group(1) is not None:
+            return None
+        tok = m.group()
+        if "'" in tok or '"' in tok:
+            tok = _QUOTED_SECTION_RE.sub(_unquote_section, tok)
+        tokens.append(tok)
+    return tokens
+
+
+@lru_cache(maxsize=256)
+def _tokenize(cmd: str) -> Tuple[str, ...]:
+    """Split *cmd* like :func:`shlex.split`, avoiding shlex where possible.
+
+    Unquoted commands and commands with only simple quoting are split with
+    regexes; shlex handles backslash escapes and reports malformed input.
+    Memoised per command string; the immutable result is safe to share,
+    while parse_bwrap_command still builds a fresh dict on every call.
+    """
+    if _QUOTING_RE.search(cmd) is None:
+        return tuple(_PLAIN_TOKEN_RE.findall(cmd))
+    if "\\" not in cmd:
+        tokens = _split_quoted(cmd)
+        if tokens is not None:
+            return tuple(tokens)
+    return tuple(shlex.split(cmd))
 
 
 def parse_bwrap_command(cmd: str) -> Dict[str, Any]:
@@ -68,7 +86,7 @@ def parse_bwrap_command(cmd: str) -> Dict[str, Any]:
 
     Returns a dict with keys: ``mounts``, ``env``, ``args``, ``run``.
     """
-    tokens = shlex.split(cmd)
+    tokens = _tokenize(cmd)
 
     # Skip leading 'bwrap' if present.
     if tokens and tokens[0] in ("bwrap", "/usr/bin/bwrap"):
@@ -79,51 +97,47 @@ def parse_bwrap_command(cmd: str) -> Dict[str, Any]:
     args: List[str] = []
     run: Optional[List[str]] = None
 
-    i = 0
-    while i < len(tokens):
-        tok = tokens[i]
-
-        if tok == "--":
-            run = tokens[i + 1:]
-            break
-
-        if tok in _BIND_FLAGS and i + 2 < len(tokens):
-            host = tokens[i + 1]
-            container = tokens[i + 2]
-            mode = "ro" if tok in _RO_BIND_FLAGS else "rw"
-            mounts.append({"host": host, "container": container, "mode": mode})
-            i += 3
-            continue
-
-        if tok == "--setenv" and i + 2 < len(tokens):
-            env[tokens[i + 1]] = tokens[i + 2]
-            i += 3
-            continue
-
-        if tok in _TWO_ARG_FLAGS and i + 2 < len(tokens):
-            args += [tok, tokens[i + 1], tokens[i + 2]]
-            i += 3
-            continue
-
-        if tok in _ONE_ARG_FLAGS and i + 1 < len(tokens):
-            args += [tok, tokens[i + 1]]
-            i += 2
-            continue
-
-        if tok in _ZERO_ARG_FLAGS:
+    ops_get = _FLAG_OPS.get
+    it = iter(tokens)
+    for tok in it:
+        op = ops_get(tok)
+        if op is None or op == _OP_ZERO:
+            # Zero-arg flag or unknown token – kept as a raw arg.
             args.append(tok)
-            i += 1
-            continue
-
-        # Unknown token – keep it as a raw arg.
-        args.append(tok)
-        i += 1
-
-    result: Dict[str, Any] = {
-        "mounts": mounts,
-        "env": env,
-        "args": args,
-    }
-    if run is not None:
-        result["run"] = run
-    return result
+        elif op == _OP_END:
+            run = list(it)
+            break
+        elif op == _OP_ONE:
+            value = next(it, None)
+            if value is None:
+                args.append(tok)
+            else:
+                args.extend((tok, value))
+        else:
+            first = next(it, None)
+            second = next(it, None)
+            if second is None:
+                # Two-value flag truncated at the end of the command.  Any
+                # lone operand is the last token and is kept as it would be
+                # on its own: ``--`` starts an empty run, anything else is a
+                # raw arg.
+                args.append(tok)
+                if first == "--":
+                    run = []
+                elif first is not None:
+                    args.append(first)
+                break
+            if op == _OP_BIND:
+                mounts.append({
+                    "host": first,
+                    "container": second,
+                    "mode": _BIND_MODES[tok],
+                })
+            elif op == _OP_SETENV:
+                env[first] = second
+            else:
+                args.extend((tok, first, second))
+
+    if run is None:
+        return {"mounts": mounts, "env": env, "args": args}
+    return {"mounts": mounts, "env": env, "args": args, "run": run}
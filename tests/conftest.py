@@ -0,0 +1,15 @@
+import pytest
+
+from bwrap_compose.config import clear_profile_cache
+from bwrap_compose.manifest import clear_manifest_cache
+
+
+@pytest.fixture(autouse=True)
+def _isolated_profile_cache(tmp_path_factory, monkeypatch):
+    """Keep the persistent parse cache out of the user's home directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path_factory.mktemp("cache")))
+    clear_profile_cache()
+    clear_manifest_cache()
+    yield
+    clear_profile_cache()
+    clear_manifest_cache()
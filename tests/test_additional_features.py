@@ -1,6 +1,8 @@
 """Tests for task-6 additional features: validate, list-profiles, extends, tmpfs/dev/proc."""
 
 import json
+import subprocess
+import sys
 from pathlib import Path
 
 import yaml
@@ -125,6 +127,27 @@ class TestExtends:
         with pytest.raises(ValueError, match="Circular"):
             load_profile(str(tmp_path / "a.yaml"))
 
+    def test_extends_shared_ancestor_is_not_circular(self, tmp_path):
+        base = {"env": {"BASE": "1"}, "args": ["--unshare-pid"]}
+        left = {"extends": "base", "env": {"L": "1"}}
+        right = {"extends": "base", "env": {"R": "1"}}
+        child = {"extends": ["left", "right"]}
+        for name, data in (("base", base), ("left", left), ("right", right), ("child", child)):
+            (tmp_path / f"{name}.yaml").write_text(yaml.dump(data))
+
+        data = load_profile(str(tmp_path / "child.yaml"))
+        assert data["env"] == {"BASE": "1", "L": "1", "R": "1"}
+        assert data["args"] == ["--unshare-pid"]
+
+    def test_extends_longer_cycle_detected(self, tmp_path):
+        (tmp_path / "a.yaml").write_text(yaml.dump({"extends": "b"}))
+        (tmp_path / "b.yaml").write_text(yaml.dump({"extends": "c"}))
+        (tmp_path / "c.yaml").write_text(yaml.dump({"extends": "a"}))
+
+        import pytest
+        with pytest.raises(ValueError, match="Circular"):
+            load_profile(str(tmp_path / "a.yaml"))
+
     def test_extends_child_overrides_parent(self, tmp_path):
         base = {"env": {"A": "old", "B": "keep"}}
         child = {"extends": "base", "env": {"A": "new"}}
@@ -195,3 +218,25 @@ class TestListProfiles:
         result = runner.invoke(app, ["list-profiles", "--config-dir", str(tmp_path)])
         assert result.exit_code == 0
         assert "custom" in result.output
+
+
+# ── Lazy imports ─────────────────────────────────────────────────────────
+
+class TestLazyImports:
+    def test_cli_import_skips_command_specific_modules(self):
+        code = (
+            "import sys, bwrap_compose.cli; "
+            "print(' '.join(sorted(m for m in sys.modules if m.startswith('bwrap_compose.'))))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        ).stdout.split()
+        for module in ("parser", "conflicts", "manifest"):
+            assert f"bwrap_compose.{module}" not in out
+
+    def test_package_exports_resolve_lazily(self):
+        import bwrap_compose
+        from bwrap_compose.parser import parse_bwrap_command
+
+        assert bwrap_compose.parse_bwrap_command is parse_bwrap_command
+        assert sorted(bwrap_compose.__all__) == sorted(bwrap_compose._EXPORTS)
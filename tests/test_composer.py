@@ -10,3 +10,30 @@ def test_compose_merges_mounts_and_env_and_args():
     assert merged['env']['X'] == "2"
     assert merged['env']['Y'] == "y"
     assert "--foo" in merged['args'] and "--bar" in merged['args']
+
+
+def test_compose_dedup_keeps_first_seen_order():
+    a = {"host": "/a", "container": "/a", "mode": "ro"}
+    b = {"host": "/b", "container": "/b", "mode": "rw"}
+    merged = compose_profiles([
+        {"mounts": [a, b], "tmpfs": ["/tmp", "/run"]},
+        {"mounts": [dict(b), dict(a)], "tmpfs": "/tmp"},
+    ])
+    assert merged["mounts"] == [a, b]
+    assert merged["tmpfs"] == ["/tmp", "/run"]
+
+
+def test_compose_single_profile_is_still_deduplicated():
+    m = {"host": "/a", "container": "/a", "mode": "ro"}
+    merged = compose_profiles([
+        {"mounts": [m, dict(m)], "args": ["--dir", "/x", "--unshare-net", "--dir", "/x"]},
+    ])
+    assert merged["mounts"] == [m]
+    assert merged["args"] == ["--unshare-net", "--dir", "/x"]
+
+
+def test_compose_dedups_mounts_with_list_values():
+    m = {"host": "/a", "container": "/a", "options": ["nodev", "nosuid"]}
+    other = {"host": "/a", "container": "/a", "options": ["nodev"]}
+    merged = compose_profiles([{"mounts": [m]}, {"mounts": [dict(m, options=list(m["options"])), other]}])
+    assert merged["mounts"] == [m, other]
@@ -1,4 +1,8 @@
 import json
+import math
+import os
+import sys
+from bwrap_compose import config
 from bwrap_compose.config import load_profile
 
 
@@ -16,3 +20,156 @@ def test_load_profile_plain(tmp_path):
     p.write_text(json.dumps(data))
     out = load_profile(str(p))
     assert out == data
+
+
+def test_load_profile_returns_independent_copies(tmp_path):
+    p = tmp_path / "p.json"
+    p.write_text(json.dumps({"env": {"A": "1"}}))
+    first = load_profile(str(p))
+    first["env"]["A"] = "mutated"
+    assert load_profile(str(p)) == {"env": {"A": "1"}}
+
+
+def test_load_profile_reparses_modified_file(tmp_path):
+    p = tmp_path / "p.json"
+    p.write_text(json.dumps({"env": {"A": "1"}}))
+    assert load_profile(str(p)) == {"env": {"A": "1"}}
+    p.write_text(json.dumps({"env": {"A": "22"}}))
+    assert load_profile(str(p)) == {"env": {"A": "22"}}
+
+
+def test_load_profile_uses_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("BWRAP_COMPOSE_DISK_CACHE", "1")
+    p = tmp_path / "p.yaml"
+    p.write_text("env:\n  A: '1'\n")
+    assert load_profile(str(p)) == {"env": {"A": "1"}}
+
+    config.clear_profile_cache()
+
+    def _fail(*args):
+        raise AssertionError("profile should have come from the disk cache")
+
+    monkeypatch.setattr(config, "_parse_text", _fail)
+    assert load_profile(str(p)) == {"env": {"A": "1"}}
+
+
+def test_load_profile_reads_pipe_without_caching(monkeypatch):
+    r, w = os.pipe()
+    os.write(w, json.dumps({"env": {"A": "1"}}).encode())
+    os.close(w)
+
+    def _fail(*args):
+        raise AssertionError("pipes must not go through the disk cache")
+
+    monkeypatch.setattr(config, "_write_disk_cache", _fail)
+    try:
+        assert load_profile(f"/dev/fd/{r}") == {"env": {"A": "1"}}
+    finally:
+        os.close(r)
+    assert not config._PARSE_CACHE
+
+
+def test_load_profile_disk_cache_is_off_by_default(tmp_path, monkeypatch):
+    def _fail(*args):
+        raise AssertionError("disk cache used without opting in")
+
+    monkeypatch.setattr(config, "_read_disk_cache", _fail)
+    monkeypatch.setattr(config, "_write_disk_cache", _fail)
+    p = tmp_path / "p.json"
+    p.write_text(json.dumps({"env": {"A": "1"}}))
+    assert load_profile(str(p)) == {"env": {"A": "1"}}
+
+
+def test_load_profile_ignores_group_writable_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("BWRAP_COMPOSE_DISK_CACHE", "1")
+    p = tmp_path / "p.json"
+    p.write_text(json.dumps({"env": {"A": "1"}}))
+    load_profile(str(p))
+    entry = config._disk_cache_path(str(p.resolve()))
+    cached = json.loads(entry.read_text())
+    cached["data"] = {"env": {"A": "tampered"}}
+    entry.write_text(json.dumps(cached))
+    os.chmod(entry, 0o664)
+    config.clear_profile_cache()
+    assert load_profile(str(p)) == {"env": {"A": "1"}}
+
+
+def test_load_profile_lowercases_mount_modes(tmp_path):
+    data = {"mounts": [{"host": "/a", "container": "/a", "mode": "RO"}]}
+    p = tmp_path / "p.json"
+    p.write_text(json.dumps(data))
+    out = load_profile(str(p))
+    assert out["mounts"][0]["mode"] == "ro"
+
+
+def test_load_profile_interns_mount_modes_from_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("BWRAP_COMPOSE_DISK_CACHE", "1")
+    p = tmp_path / "p.json"
+    p.write_text(json.dumps({"mounts": [{"host": "/a", "container": "/a", "mode": "Rw"}]}))
+    load_profile(str(p))
+    config.clear_profile_cache()
+    assert load_profile(str(p))["mounts"][0]["mode"] is sys.intern("rw")
+
+
+def test_load_profile_interns_arg_flags(tmp_path):
+    p = tmp_path / "p.yaml"
+    p.write_text("args: ['--dir', '/some/path']\n")
+    args = load_profile(str(p))["args"]
+    assert args == ["--dir", "/some/path"]
+    assert args[0] is sys.intern("--dir")
+
+
+def test_yaml_loader_prefers_libyaml():
+    import yaml
+
+    expected = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    assert config._yaml_loader() is expected
+
+
+def test_json_profile_skips_yaml(tmp_path, monkeypatch):
+    def _fail():
+        raise AssertionError("YAML loader used for a .json profile")
+
+    monkeypatch.setattr(config, "_yaml_loader", _fail)
+    p = tmp_path / "p.json"
+    p.write_text(json.dumps({"env": {"A": "1"}}))
+    assert load_profile(str(p)) == {"env": {"A": "1"}}
+
+
+def test_json_profile_uses_orjson_when_available(tmp_path, monkeypatch):
+    calls = []
+
+    def _loads(text):
+        calls.append(text)
+        return json.loads(text)
+
+    monkeypatch.setattr(config, "_orjson_loads", lambda: _loads)
+    p = tmp_path / "p.json"
+    p.write_text(json.dumps({"env": {"A": "1"}}))
+    assert load_profile(str(p), use_cache=False) == {"env": {"A": "1"}}
+    assert len(calls) == 1
+
+
+def test_json_falls_back_to_stdlib_when_orjson_rejects(monkeypatch):
+    def _strict(text):
+        raise ValueError("unsupported")
+
+    monkeypatch.setattr(config, "_orjson_loads", lambda: _strict)
+    assert math.isnan(config._parse_text('{"x": NaN}', ".json")["x"])
+
+
+def test_load_profile_without_cache_always_parses(tmp_path, monkeypatch):
+    p = tmp_path / "p.json"
+    p.write_text(json.dumps({"env": {"A": "1"}}))
+    load_profile(str(p))
+
+    calls = []
+    real_parse = config._parse_text
+
+    def _counting(*args):
+        calls.append(args)
+        return real_parse(*args)
+
+    monkeypatch.setattr(config, "_parse_text", _counting)
+    assert load_profile(str(p), use_cache=False) == {"env": {"A": "1"}}
+    assert len(calls) == 1
@@ -1,11 +1,12 @@
 """Tests for the --config-dir CLI option and profile resolution."""
 
 import json
+import os
 from pathlib import Path
 
 from typer.testing import CliRunner
 
-from bwrap_compose.cli import app, _resolve_profile_path
+from bwrap_compose.cli import app, _BUILTIN_PROFILE_DIR, _resolve_profile_path
 
 runner = CliRunner()
 
@@ -51,6 +52,47 @@ class TestResolveProfilePath:
         result = _resolve_profile_path("python-uv", extra_dirs=[d])
         assert result == f
 
+    def test_directory_with_profile_name_is_not_a_literal_path(self, tmp_path, monkeypatch):
+        (tmp_path / "python-uv").mkdir()
+        monkeypatch.chdir(tmp_path)
+        result = _resolve_profile_path("python-uv")
+        assert result.name == "python-uv.yaml"
+
+    def test_profile_added_after_first_lookup_is_found(self, tmp_path):
+        d = tmp_path / "cfgs"
+        d.mkdir()
+        (d / "first.yaml").write_text("env: {}")
+        assert _resolve_profile_path("first", extra_dirs=[d]) == d / "first.yaml"
+        f = d / "second.yaml"
+        f.write_text("env: {}")
+        os.utime(d, ns=(0, 0))  # guarantee an mtime change on coarse clocks
+        assert _resolve_profile_path("second", extra_dirs=[d]) == f
+
+    def test_resolves_fifo_as_literal_path(self, tmp_path):
+        fifo = tmp_path / "p.yaml"
+        os.mkfifo(fifo)
+        assert _resolve_profile_path(str(fifo)) == fifo
+
+    def test_resolves_sub_path_name_from_extra_dir(self, tmp_path):
+        d = tmp_path / "cfg"
+        (d / "sub").mkdir(parents=True)
+        f = d / "sub" / "p.yaml"
+        f.write_text("env: {}")
+        assert _resolve_profile_path("sub/p", extra_dirs=[d]) == f
+
+    def test_dangling_symlink_does_not_shadow_later_dir(self, tmp_path):
+        d = tmp_path / "cfg"
+        d.mkdir()
+        (d / "python-uv.yaml").symlink_to(tmp_path / "missing.yaml")
+        result = _resolve_profile_path("python-uv", extra_dirs=[d])
+        assert result == _BUILTIN_PROFILE_DIR / "python-uv.yaml"
+
+    def test_directory_named_like_profile_does_not_shadow_later_dir(self, tmp_path):
+        d = tmp_path / "cfg"
+        (d / "python-uv.yaml").mkdir(parents=True)
+        result = _resolve_profile_path("python-uv", extra_dirs=[d])
+        assert result == _BUILTIN_PROFILE_DIR / "python-uv.yaml"
+
     def test_falls_back_to_builtin(self):
         """Built-in profiles should still be found without extra dirs."""
         result = _resolve_profile_path("python-uv")
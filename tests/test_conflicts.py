@@ -52,6 +52,29 @@ class TestRoWritableSubdir:
         conflicts = detect_conflicts(profiles)
         assert not any(c.kind == "ro-writable-subdir" for c in conflicts)
 
+    def test_each_ro_ancestor_reported(self):
+        profiles = [
+            {"mounts": [
+                {"host": "/", "container": "/", "mode": "ro"},
+                {"host": "/usr", "container": "/usr", "mode": "ro"},
+                {"host": "/usr/lib", "container": "/usr/lib", "mode": "ro"},
+                {"host": "/tmp", "container": "/usr/local", "mode": "rw"},
+            ]},
+        ]
+        conflicts = detect_conflicts(profiles)
+        nested = [c for c in conflicts if c.kind == "ro-writable-subdir"]
+        assert len(nested) == 2
+
+    def test_no_conflict_shared_name_prefix(self):
+        profiles = [
+            {"mounts": [
+                {"host": "/a", "container": "/opt/app", "mode": "ro"},
+                {"host": "/b", "container": "/opt/app-data", "mode": "rw"},
+            ]},
+        ]
+        conflicts = detect_conflicts(profiles)
+        assert not any(c.kind == "ro-writable-subdir" for c in conflicts)
+
 
 class TestEnvOverrides:
     def test_env_override_detected(self):
@@ -6,6 +6,7 @@ import subprocess
 
 import pytest
 
+from bwrap_compose import manifest
 from bwrap_compose.manifest import manifest_from_binary, _parse_ldd_output
 
 
@@ -36,6 +37,23 @@ class TestParseLddOutput:
             assert "/usr/lib64/ld-linux-x86-64.so.2" in libs
             assert ("/usr/lib64/ld-linux-x86-64.so.2", "/lib64/ld-linux-x86-64.so.2") in symlinks
 
+    def test_resolved_path_may_contain_spaces(self, tmp_path):
+        lib = tmp_path / "my libs" / "libfoo.so.1"
+        lib.parent.mkdir()
+        lib.write_text("")
+        output = f"\tlibfoo.so.1 => {lib} (0x00007f00)\n\t{lib} (0x00007f01)\n"
+        libs, symlinks = _parse_ldd_output(output)
+        assert libs == [str(lib), str(lib)]
+        assert symlinks == []
+
+    def test_skips_not_found_lines(self, tmp_path):
+        lib = tmp_path / "libfoo.so.1"
+        lib.write_text("")
+        output = f"\tlibbar.so.2 => not found\n\t{lib} => not found\n"
+        libs, symlinks = _parse_ldd_output(output)
+        assert libs == []
+        assert symlinks == []
+
 
 class TestManifestFromBinary:
     """Test manifest generation from a binary."""
@@ -85,6 +103,28 @@ class TestManifestFromBinary:
         for mount in profile["mounts"]:
             assert mount["mode"] == "ro"
 
+    def test_repeat_calls_reuse_ldd_result(self, tmp_path, monkeypatch):
+        binary = tmp_path / "tool"
+        binary.write_text("")
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+        monkeypatch.setattr(manifest.subprocess, "run", fake_run)
+        first = manifest_from_binary(str(binary))
+        first["mounts"].clear()
+        second = manifest_from_binary(str(binary), description="tool")
+        assert len(calls) == 1
+        assert second["mounts"] == [{"host": str(binary), "container": str(binary), "mode": "ro"}]
+        assert second["description"] == "tool"
+        assert "description" not in manifest_from_binary(str(binary))
+
+        os.utime(binary, ns=(0, 0))
+        manifest_from_binary(str(binary))
+        assert len(calls) == 2
+
 
 @pytest.mark.skipif(
     not shutil.which("bwrap"),
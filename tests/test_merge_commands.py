@@ -57,6 +57,38 @@ class TestParseBwrapCommand:
         assert "--proc" in result["args"]
         assert "/proc" in result["args"]
 
+    def test_tokenizes_like_shlex(self):
+        for cmd in (
+            "bwrap\t--ro-bind /a\u00a0b /c -- /bin/sh",
+            "bwrap --setenv MSG 'hello world' -- /bin/sh -c \"echo $MSG\"",
+            "bwrap --bind /x\\ y /x\\ y",
+            "bwrap --setenv EMPTY '' --setenv MIX a'b c'\"d 'e\" -- /bin/true",
+        ):
+            assert parse_bwrap_command(cmd) == parse_bwrap_command(
+                " ".join(shlex.quote(t) for t in shlex.split(cmd))
+            )
+        result = parse_bwrap_command("bwrap --setenv EMPTY '' --setenv MIX a'b c'\"d 'e\"")
+        assert result["env"] == {"EMPTY": "", "MIX": "ab cd 'e"}
+        result = parse_bwrap_command("bwrap --ro-bind /a\u00a0b /c")
+        assert result["mounts"][0]["host"] == "/a\u00a0b"
+
+    def test_truncated_flags_kept_as_raw_args(self):
+        assert parse_bwrap_command("bwrap --unshare-pid --bind /a")["args"] == [
+            "--unshare-pid", "--bind", "/a",
+        ]
+        result = parse_bwrap_command("bwrap --setenv --")
+        assert result["args"] == ["--setenv"]
+        assert result["run"] == []
+
+    def test_repeated_parse_returns_independent_results(self):
+        cmd = "bwrap --ro-bind / / --unshare-pid -- /bin/sh"
+        first = parse_bwrap_command(cmd)
+        first["args"].append("--mutated")
+        first["run"].append("-c")
+        second = parse_bwrap_command(cmd)
+        assert second["args"] == ["--unshare-pid"]
+        assert second["run"] == ["/bin/sh"]
+
 
 class TestMergeRoundTrip:
     """Parse two commands, merge, and verify the result."""
@@ -128,3 +160,18 @@ class TestMergeCommandsCLI:
         content = script.read_text()
         assert content.startswith("#!/usr/bin/env sh")
         assert "--ro-bind" in content
+
+    def test_merge_commands_output_script_is_executable(self, tmp_path):
+        script = tmp_path / "merged.sh"
+        script.write_text("old contents that are longer than the new script " * 20)
+        script.chmod(0o600)
+        result = runner.invoke(app, [
+            "merge-commands",
+            "bwrap --ro-bind / / -- /bin/sh",
+            "bwrap --bind /tmp /tmp -- /bin/sh",
+            "--output-script", str(script),
+        ])
+        assert result.exit_code == 0
+        assert script.stat().st_mode & 0o777 == 0o755
+        assert script.read_text().startswith("#!/usr/bin/env sh\nexec bwrap")
+        assert "old contents" not in script.read_text()
@@ -3,6 +3,14 @@
 from bwrap_compose.composer import compose_profiles, _group_args, _organize_args
 
 
+def _pos(args):
+    """Map each token to the index of its first occurrence (like list.index)."""
+    positions = {}
+    for i, tok in enumerate(args):
+        positions.setdefault(tok, i)
+    return positions
+
+
 class TestTwoArgGrouping:
     """Test that two-arg flags are properly grouped for dedup."""
 
@@ -97,11 +105,11 @@ class TestArgsOrganization:
             "args": ["--unshare-all", "--dir", "/lib", "--die-with-parent"],
         }
         merged = compose_profiles([p1, p2])
-        args = merged["args"]
+        pos = _pos(merged["args"])
         # Check order: namespace, dirs, late
-        assert args.index("--unshare-all") < args.index("--dir")
-        assert args.index("--die-with-parent") < args.index("--dir")
-        assert args.index("--chdir") > args.index("--dir")
+        assert pos["--unshare-all"] < pos["--dir"]
+        assert pos["--die-with-parent"] < pos["--dir"]
+        assert pos["--chdir"] > pos["--dir"]
 
     def test_dedup_and_organize_combined(self):
         """Dedup should work with organization."""
@@ -113,5 +121,6 @@ class TestArgsOrganization:
         assert args.count("--dir") == 1
         assert args.count("--chdir") == 1
         # Organized: namespace first, dir middle, chdir last
-        assert args.index("--unshare-all") < args.index("--dir")
-        assert args.index("--dir") < args.index("--chdir")
+        pos = _pos(args)
+        assert pos["--unshare-all"] < pos["--dir"]
+        assert pos["--dir"] < pos["--chdir"]